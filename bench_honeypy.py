@@ -0,0 +1,429 @@
+#!/usr/bin/env python3
+"""Load generator for the SSH honeypot.
+
+Starts ssh_honeypy.py on loopback, drives it with a swarm of paramiko clients
+and reports handshake latency, sessions/s, commands/s, peak threads and RSS per
+session. Clients connect from spread 127.0.0.x source addresses so the
+per-IP session cap does not throttle the swarm.
+
+    python bench_honeypy.py --scenarios auth,exec --sessions 500 --json results.json
+    python bench_honeypy.py --baseline results.json --tolerance 0.2   # exit 1 on regression
+    python bench_honeypy.py --scenarios enrichment --ranges 2000000    # in-process, no server
+"""
+import argparse
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import paramiko
+
+HONEYPOT = Path(__file__).resolve().parent / "ssh_honeypy.py"
+PASSWORD = "bench-secret"
+DONE_MARKER = "__BENCH_DONE__"
+
+# Metrics compared against a baseline: name -> True if higher is better
+TRACKED_METRICS = {
+    "sessions_per_s": True,
+    "commands_per_s": True,
+    "handshake_p50_ms": False,
+    "handshake_p99_ms": False,
+    "rss_per_session_kb": False,
+    "lookup_p99_us": False,
+    "cached_p50_us": False,
+}
+
+# ====================== PROCESS MONITOR ======================
+def _process_tree(pid):
+    pids = [pid]
+    for current in pids:
+        try:
+            children = Path(f"/proc/{current}/task/{current}/children").read_text().split()
+        except OSError:
+            continue
+        pids.extend(int(child) for child in children)
+    return pids
+
+def sample_process(pid):
+    """(rss_kb, threads) summed over pid and its children"""
+    rss = threads = 0
+    for current in _process_tree(pid):
+        try:
+            status = Path(f"/proc/{current}/status").read_text()
+        except OSError:
+            continue
+        for line in status.splitlines():
+            if line.startswith("VmRSS:"):
+                rss += int(line.split()[1])
+            elif line.startswith("Threads:"):
+                threads += int(line.split()[1])
+    return rss, threads
+
+class Monitor:
+    """Samples RSS and thread count of the honeypot in the background"""
+    def __init__(self, pid, interval=0.05):
+        self.pid = pid
+        self.interval = interval
+        self.peak_rss = 0
+        self.peak_threads = 0
+        self.running = False
+
+    def __enter__(self):
+        self.peak_rss, self.peak_threads = sample_process(self.pid)
+        self.running = True
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.running = False
+        self.thread.join()
+
+    def _run(self):
+        while self.running:
+            rss, threads = sample_process(self.pid)
+            self.peak_rss = max(self.peak_rss, rss)
+            self.peak_threads = max(self.peak_threads, threads)
+            time.sleep(self.interval)
+
+# ====================== CLIENTS ======================
+class Swarm:
+    def __init__(self, port, source_ips=250):
+        self.port = port
+        self.source_ips = source_ips
+        self.next_ip = 0
+        self.lock = threading.Lock()
+
+    def connect(self):
+        """Open a transport from the next source address, returns (transport, handshake seconds)"""
+        with self.lock:
+            self.next_ip = self.next_ip % self.source_ips + 1
+            source = f"127.0.0.{self.next_ip + 1}"
+        start = time.perf_counter()
+        sock = socket.create_connection(("127.0.0.1", self.port), timeout=30, source_address=(source, 0))
+        transport = paramiko.Transport(sock)
+        transport.start_client(timeout=30)
+        return transport, time.perf_counter() - start
+
+def run_auth(swarm, attempts):
+    """Brute force: several wrong passwords per connection"""
+    transport, handshake = swarm.connect()
+    try:
+        for i in range(attempts):
+            try:
+                transport.auth_password("root", f"guess-{i}")
+            except paramiko.AuthenticationException:
+                pass
+    finally:
+        transport.close()
+    return handshake, 0
+
+def _open_shell(swarm):
+    transport, handshake = swarm.connect()
+    transport.auth_password("admin", PASSWORD)
+    channel = transport.open_session()
+    channel.get_pty()
+    channel.invoke_shell()
+    return transport, channel, handshake
+
+def _read_until(channel, marker, count, timeout=30):
+    data = ""
+    deadline = time.monotonic() + timeout
+    channel.settimeout(timeout)
+    while data.count(marker) < count and time.monotonic() < deadline:
+        chunk = channel.recv(65536)
+        if not chunk:
+            break
+        data += chunk.decode("utf-8", "replace")
+    return data
+
+def run_paste(swarm, script_lines):
+    """Interactive session pasting a whole script in one burst"""
+    transport, channel, handshake = _open_shell(swarm)
+    try:
+        script = [
+            "uname -a", "cat /etc/passwd", "cd /tmp", "ls -la", "whoami", "id", "pwd", "cd ~",
+        ]
+        lines = [script[i % len(script)] for i in range(script_lines)]
+        lines.append(f"echo {DONE_MARKER}")
+        channel.sendall(("\r".join(lines) + "\r").encode())
+        # The marker shows up once in the echoed command line and once as output
+        _read_until(channel, DONE_MARKER, 2)
+    finally:
+        transport.close()
+    return handshake, len(lines)
+
+def run_exec(swarm):
+    """One-shot exec request"""
+    transport, handshake = swarm.connect()
+    try:
+        transport.auth_password("admin", PASSWORD)
+        channel = transport.open_session()
+        channel.exec_command("uname -a; cat /proc/cpuinfo")
+        channel.settimeout(30)
+        while channel.recv(65536):
+            pass
+        channel.recv_exit_status()
+    finally:
+        transport.close()
+    return handshake, 1
+
+# ====================== SCENARIOS ======================
+def percentile(values, pct):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+def run_load(pid, clients, sessions, task):
+    """Run task sessions times with clients concurrent workers and summarize"""
+    handshakes, errors, commands = [], 0, 0
+    start_rss, _ = sample_process(pid)
+    with Monitor(pid) as monitor:
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=clients) as pool:
+            for future in [pool.submit(task) for _ in range(sessions)]:
+                try:
+                    handshake, executed = future.result()
+                    handshakes.append(handshake)
+                    commands += executed
+                except Exception:
+                    errors += 1
+        duration = time.perf_counter() - start
+    return summarize(handshakes, errors, commands, duration, monitor, start_rss, None)
+
+def run_idle(pid, swarm, sessions, hold):
+    """Open many shells, hold them and measure what each one costs"""
+    opened, handshakes, errors = [], [], 0
+    start_rss, _ = sample_process(pid)
+    with Monitor(pid) as monitor:
+        start = time.perf_counter()
+        for _ in range(sessions):
+            try:
+                transport, channel, handshake = _open_shell(swarm)
+                opened.append(transport)
+                handshakes.append(handshake)
+            except Exception:
+                errors += 1
+        duration = time.perf_counter() - start
+        time.sleep(hold)
+        held_rss, _ = sample_process(pid)
+    for transport in opened:
+        transport.close()
+    return summarize(handshakes, errors, 0, duration, monitor, start_rss, held_rss)
+
+def summarize(handshakes, errors, commands, duration, monitor, start_rss, held_rss):
+    sessions = len(handshakes)
+    ms = [h * 1000 for h in handshakes]
+    rss_growth = (held_rss if held_rss is not None else monitor.peak_rss) - start_rss
+    return {
+        "sessions": sessions,
+        "errors": errors,
+        "duration_s": round(duration, 3),
+        "sessions_per_s": round(sessions / duration, 2) if duration else None,
+        "commands_per_s": round(commands / duration, 2) if duration and commands else None,
+        "handshake_p50_ms": round(percentile(ms, 50), 2) if ms else None,
+        "handshake_p90_ms": round(percentile(ms, 90), 2) if ms else None,
+        "handshake_p99_ms": round(percentile(ms, 99), 2) if ms else None,
+        "handshake_max_ms": round(max(ms), 2) if ms else None,
+        "peak_threads": monitor.peak_threads,
+        "peak_rss_mb": round(monitor.peak_rss / 1024, 1),
+        "rss_per_session_kb": round(rss_growth / sessions, 1) if sessions else None,
+    }
+
+def run_enrichment(ranges, lookups):
+    """Load a synthetic CIDR database of about `ranges` networks and time IP lookups.
+
+    Runs in this process against the honeypot's own IpEnrichment. Networks are
+    laid out evenly over the IPv4 space with every 16th one nested inside a
+    wider network, so the index also has to split overlapping ranges.
+    """
+    sys.path.insert(0, str(HONEYPOT.parent))
+    import ssh_honeypy
+
+    rng = random.Random(0)
+    block = 1 << max(0, (2 ** 32 // ranges).bit_length() - 1)
+    prefix = 32 - block.bit_length() + 1
+    countries = ["US", "CN", "RU", "DE", "BR", "IN", "NL", "FR", "KR", "VN"]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "networks.csv"
+        with open(path, "w") as f:
+            f.write("network,asn,country\n")
+            for i in range(min(ranges, 2 ** 32 // block)):
+                start = i * block
+                f.write(f"{socket.inet_ntoa(start.to_bytes(4, 'big'))}/{prefix},"
+                        f"{i % 60000 + 1},{countries[i % len(countries)]}\n")
+                if i % 16 == 0 and prefix > 4:
+                    f.write(f"{socket.inet_ntoa(start.to_bytes(4, 'big'))}/{prefix - 4},"
+                            f"{i % 60000 + 1},{countries[i % len(countries)]}\n")
+        start = time.perf_counter()
+        db = ssh_honeypy.IpEnrichment.from_csv(path)
+        load = time.perf_counter() - start
+
+    addresses = [socket.inet_ntoa(rng.getrandbits(32).to_bytes(4, "big")) for _ in range(lookups)]
+    timings = []
+    start = time.perf_counter()
+    for ip in addresses:
+        before = time.perf_counter_ns()
+        db.find(ip)
+        timings.append((time.perf_counter_ns() - before) / 1000)
+    duration = time.perf_counter() - start
+
+    # A small set of repeat visitors, as seen by the LRU cache
+    hot = addresses[:1000]
+    for ip in hot:
+        db.lookup(ip)
+    cached = []
+    for ip in hot * (lookups // len(hot) or 1):
+        before = time.perf_counter_ns()
+        db.lookup(ip)
+        cached.append((time.perf_counter_ns() - before) / 1000)
+    return {
+        "ranges": len(db),
+        "load_s": round(load, 2),
+        "lookups_per_s": round(lookups / duration),
+        "lookup_p50_us": round(percentile(timings, 50), 2),
+        "lookup_p99_us": round(percentile(timings, 99), 2),
+        "cached_p50_us": round(percentile(cached, 50), 2),
+    }
+
+# ====================== HONEYPOT PROCESS ======================
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def start_honeypot(port, workers, log_dir):
+    # A scratch log directory keeps the benchmark's fake credentials out of the real captures
+    command = [sys.executable, str(HONEYPOT), "--host", "127.0.0.1", "--port", str(port),
+               "--password", PASSWORD, "--workers", str(workers), "--no-auth-limit", "--log-dir", log_dir]
+    process = subprocess.Popen(command, cwd=HONEYPOT.parent, stdout=subprocess.DEVNULL,
+                               stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 15
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Honeypot exited with {process.returncode}")
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+            return process
+        except OSError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError("Honeypot did not start listening")
+
+def stop_honeypot(process):
+    process.send_signal(2)  # SIGINT, same as Ctrl+C
+    try:
+        process.wait(15)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+# ====================== REPORTING ======================
+def compare(results, baseline, tolerance):
+    """Regressions of tracked metrics beyond tolerance, as printable strings"""
+    regressions = []
+    for scenario, metrics in results["scenarios"].items():
+        previous = baseline.get("scenarios", {}).get(scenario, {})
+        for name, higher_is_better in TRACKED_METRICS.items():
+            old, new = previous.get(name), metrics.get(name)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            if (higher_is_better and change < -tolerance) or (not higher_is_better and change > tolerance):
+                regressions.append(f"{scenario}.{name}: {old} -> {new} ({change:+.0%})")
+    return regressions
+
+def print_table(results):
+    columns = ["sessions", "errors", "sessions_per_s", "commands_per_s", "handshake_p50_ms",
+               "handshake_p99_ms", "peak_threads", "peak_rss_mb", "rss_per_session_kb",
+               "ranges", "load_s", "lookup_p50_us", "lookup_p99_us", "cached_p50_us"]
+    columns = [c for c in columns if any(c in m for m in results["scenarios"].values())]
+    rows = [[name] + ["" if m.get(c) is None else str(m.get(c)) for c in columns]
+            for name, m in results["scenarios"].items()]
+    header = ["scenario"] + columns
+    widths = [max(len(row[i]) for row in rows + [header]) for i in range(len(header))]
+    for row in [header] + rows:
+        print("  ".join(value.rjust(width) for value, width in zip(row, widths)))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the SSH honeypot on loopback")
+    parser.add_argument("--scenarios", default="auth,paste,idle,exec",
+                        help="comma separated: auth, paste, idle, exec, enrichment")
+    parser.add_argument("--workers", type=int, default=1, help="honeypot worker processes")
+    parser.add_argument("--clients", type=int, default=32, help="concurrent clients")
+    parser.add_argument("--sessions", type=int, default=200, help="sessions per load scenario")
+    parser.add_argument("--attempts", type=int, default=5, help="passwords per auth session")
+    parser.add_argument("--script-lines", type=int, default=200, help="lines pasted per paste session")
+    # Held shells each occupy a session worker; past the server's WORKER_POOL_SIZE (64)
+    # the rest queue behind them until their handshakes time out
+    parser.add_argument("--idle-sessions", type=int, default=50,
+                        help="shells held open by the idle scenario (keep below WORKER_POOL_SIZE)")
+    parser.add_argument("--hold", type=float, default=2.0, help="seconds the idle shells are held")
+    parser.add_argument("--ranges", type=int, default=2000000, help="networks loaded by the enrichment scenario")
+    parser.add_argument("--lookups", type=int, default=100000, help="IPs looked up by the enrichment scenario")
+    parser.add_argument("--json", help="write machine-readable results to this file")
+    parser.add_argument("--baseline", help="results file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="allowed relative regression before exiting with status 1")
+    args = parser.parse_args(argv)
+
+    scenarios = [scenario.strip() for scenario in args.scenarios.split(",")]
+    port = free_port()
+    # The enrichment scenario runs in this process and needs no server
+    log_dir = tempfile.TemporaryDirectory(prefix="bench-honeypy-")
+    process = start_honeypot(port, args.workers, log_dir.name) if set(scenarios) - {"enrichment"} else None
+    swarm = Swarm(port)
+    results = {
+        "meta": {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "python": sys.version.split()[0],
+            "paramiko": paramiko.__version__,
+            "cpus": os.cpu_count(),
+            "workers": args.workers,
+            "clients": args.clients,
+        },
+        "scenarios": {},
+    }
+    try:
+        for scenario in scenarios:
+            print(f"Running {scenario}...", file=sys.stderr)
+            if scenario == "auth":
+                result = run_load(process.pid, args.clients, args.sessions,
+                                  lambda: run_auth(swarm, args.attempts))
+            elif scenario == "paste":
+                result = run_load(process.pid, args.clients, args.sessions,
+                                  lambda: run_paste(swarm, args.script_lines))
+            elif scenario == "exec":
+                result = run_load(process.pid, args.clients, args.sessions, lambda: run_exec(swarm))
+            elif scenario == "idle":
+                result = run_idle(process.pid, swarm, args.idle_sessions, args.hold)
+            elif scenario == "enrichment":
+                result = run_enrichment(args.ranges, args.lookups)
+            else:
+                parser.error(f"unknown scenario: {scenario}")
+            results["scenarios"][scenario] = result
+    finally:
+        if process is not None:
+            stop_honeypot(process)
+        log_dir.cleanup()
+
+    print_table(results)
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
+    if args.baseline:
+        regressions = compare(results, json.loads(Path(args.baseline).read_text()), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
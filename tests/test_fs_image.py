@@ -0,0 +1,76 @@
+import io
+import os
+import tarfile
+import tempfile
+import unittest
+from pathlib import Path
+
+import ssh_honeypy as honeypy
+
+
+class DirectoryLinkTests(unittest.TestCase):
+    """bin -> usr/bin, as on merged-/usr distributions"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.root = Path(self.tmp.name)
+
+    def make_tar(self):
+        path = self.root / "image.tar"
+        with tarfile.open(path, "w") as tar:
+            for name in ("usr", "usr/bin"):
+                info = tarfile.TarInfo(name)
+                info.type = tarfile.DIRTYPE
+                info.mode = 0o755
+                tar.addfile(info)
+            data = b"#!/bin/sh\n"
+            info = tarfile.TarInfo("usr/bin/python3")
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+            for name, target in (("bin", "usr/bin"), ("usr/bin/python", "python3"),
+                                 ("sbin", "bin"), ("loop", "."), ("etc", "/etc")):
+                info = tarfile.TarInfo(name)
+                info.type = tarfile.SYMTYPE
+                info.linkname = target
+                tar.addfile(info)
+        return honeypy.FilesystemImage.from_tar(path)
+
+    def make_directory(self):
+        source = self.root / "tree"
+        (source / "usr" / "bin").mkdir(parents=True)
+        (source / "usr" / "bin" / "python3").write_text("#!/bin/sh\n")
+        os.symlink("usr/bin", source / "bin")
+        os.symlink("python3", source / "usr" / "bin" / "python")
+        os.symlink("bin", source / "sbin")
+        os.symlink(".", source / "loop")
+        os.symlink("/etc", source / "etc")
+        return honeypy.FilesystemImage.from_directory(source)
+
+    def check(self, image):
+        self.assertEqual(image.get("/bin").type, "dir")
+        self.assertEqual(image.get("/bin").children, ("python", "python3"))
+        self.assertEqual(image.read(image.get("/bin/python3")), "#!/bin/sh")
+        self.assertEqual(image.read(image.get("/bin/python")), "#!/bin/sh")
+        self.assertEqual(image.read(image.get("/sbin/python3")), "#!/bin/sh")
+        self.assertIsNotNone(image.index("/bin"))
+        self.assertIn("bin", image.get("/").children)
+        # A link to its own ancestor and one leaving the image are dropped
+        self.assertIsNone(image.get("/loop"))
+        self.assertIsNone(image.get("/etc"))
+        self.assertIsNone(image.get("/etc/passwd"))
+
+    def test_tar(self):
+        self.check(self.make_tar())
+
+    def test_directory(self):
+        self.check(self.make_directory())
+
+    def test_snapshot_keeps_links(self):
+        path = self.root / "image.snap"
+        self.make_tar().save(path)
+        self.check(honeypy.FilesystemImage.load(path))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+import unittest
+
+import ssh_honeypy as honeypy
+
+
+class RedirectParsingTests(unittest.TestCase):
+    def parse(self, line):
+        [(separator, [(argv, redirects)])] = honeypy.parse_command_line(line)
+        return argv, redirects
+
+    def test_digit_argument_before_spaced_operator(self):
+        self.assertEqual(self.parse("echo 1 > f"), (["echo", "1"], [(">", "f")]))
+        self.assertEqual(self.parse("echo a 2 > f"), (["echo", "a", "2"], [(">", "f")]))
+
+    def test_attached_digit_is_a_descriptor(self):
+        self.assertEqual(self.parse("ls nope 2>/dev/null"), (["ls", "nope"], [("2>", "/dev/null")]))
+        self.assertEqual(self.parse("echo hi 2>&1"), (["echo", "hi"], [("2>&", "1")]))
+        self.assertEqual(self.parse("echo x 1>>f"), (["echo", "x"], [(">>", "f")]))
+
+    def test_quoted_or_longer_digits_stay_arguments(self):
+        self.assertEqual(self.parse('echo "2">f'), (["echo", "2"], [(">", "f")]))
+        self.assertEqual(self.parse("echo 12>f"), (["echo", "12"], [(">", "f")]))
+
+
+class RedirectExecutionTests(unittest.TestCase):
+    def setUp(self):
+        self.shell = honeypy.RealisticShell(None, "127.0.0.1")
+
+    def run_line(self, line):
+        return honeypy.run_command_line(self.shell, line)
+
+    def test_digit_is_written_to_the_file(self):
+        self.assertEqual(self.run_line("echo 1 > f"), "")
+        self.assertEqual(self.run_line("cat f"), "1")
+        self.run_line("echo a 2 > g")
+        self.assertEqual(self.run_line("cat g"), "a 2")
+
+    def test_stderr_to_dev_null(self):
+        self.assertEqual(self.run_line("ls nope 2>/dev/null"), "")
+        self.assertNotEqual(self.shell.exit_status, 0)
+        self.assertIsNone(self.shell.fs.get("/dev/null"))
+
+
+if __name__ == "__main__":
+    unittest.main()